@@ -0,0 +1,131 @@
+"""Benchmark for integer minor-unit ledgers
+
+    python benchmarks/bench_ledger.py                          # 10M rows
+    python benchmarks/bench_ledger.py --rows 1000000 --load-rows 200000
+
+Times the path a GUI refresh takes: parsing the JSON data files, building a
+Ledger from the records, and the per-currency reductions behind the
+dashboard, breakdown and monthly chart. The previous approach (adding
+Python floats one transaction at a time) is timed for comparison.
+
+Ten million parsed transaction dicts do not fit in memory on a typical
+machine, so the load step runs on --load-rows records and is also reported
+per million rows; the reductions run on the full --rows. Exactness is
+covered by tests/test_money.py and tests/test_ledger.py, including a
+10M-row check (python -m pytest --run-slow).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from ledger import Ledger, month_code  # noqa: E402
+from money import CURRENCIES, from_minor  # noqa: E402
+
+INCOME = ["Salary", "Freelance", "Investment", "Bonus", "Other Income"]
+EXPENSES = ["Food", "Transport", "Bills", "Shopping", "Entertainment", "Healthcare", "Education", "Other"]
+CATEGORIES = INCOME + EXPENSES
+
+
+def timed(fn, repeat=3):
+    """Return (best seconds, result) over a few runs"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def make_records(rows, seed=0):
+    """Transaction dicts shaped like the ones in income.json / expenses.json"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        is_income = rng.random() < 0.3
+        records.append({
+            "id": float(i),
+            "date": f"{rng.randint(2024, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "category": rng.choice(INCOME if is_income else EXPENSES),
+            "description": "",
+            "amount_minor": rng.randint(1, 10_000_000),
+            "currency": rng.choice(CURRENCIES),
+            "transaction_type": "income" if is_income else "expense"
+        })
+    return records
+
+
+def make_ledger(rows, seed=0):
+    """Random encoded columns for timing the reductions at sizes that do not fit as dicts"""
+    rng = np.random.default_rng(seed)
+    amount = rng.integers(1, 10_000_000, rows, dtype=np.int64)
+    currency = rng.integers(0, len(CURRENCIES), rows, dtype=np.int64)
+    category = rng.integers(0, len(CATEGORIES), rows, dtype=np.int64)
+    month = month_code("2024-01") + rng.integers(0, 24, rows, dtype=np.int64)
+    income = rng.random(rows) < 0.3
+    return Ledger.from_columns(amount, currency, category, month, income, CURRENCIES, CATEGORIES)
+
+
+def report(label, seconds, rows, total_rows=None):
+    line = f"  {label:<18}{seconds * 1000:10.1f} ms   ({seconds / rows * 1e6 * 1000:7.1f} ms per 1M rows"
+    if total_rows and total_rows != rows:
+        line += f", ~{seconds / rows * total_rows:.1f} s at {total_rows:,}"
+    print(line + ")")
+
+
+def bench_load(rows, total_rows):
+    print(f"Load: JSON -> records -> Ledger ({rows:,} rows)")
+    text = json.dumps(make_records(rows))
+    seconds, records = timed(lambda: json.loads(text), repeat=1)
+    report("json.loads", seconds, rows, total_rows)
+    seconds, ledger = timed(lambda: Ledger(records))
+    report("Ledger(records)", seconds, rows, total_rows)
+    return ledger
+
+
+def bench_reductions(rows):
+    print(f"Reductions ({rows:,} rows)")
+    ledger = make_ledger(rows)
+
+    seconds, _ = timed(ledger.totals)
+    report("totals", seconds, rows)
+    seconds, _ = timed(ledger.category_totals)
+    report("category_totals", seconds, rows)
+    months = [f"{2024 + i // 12}-{i % 12 + 1:02d}" for i in range(12, 24)]
+    seconds, _ = timed(lambda: ledger.monthly_totals(months))
+    report("monthly_totals", seconds, rows)
+
+    # The previous approach: one Python float addition per transaction dict
+    sample = min(rows, 1_000_000)
+    records = [{"amount": from_minor(a, CURRENCIES[c]), "currency": CURRENCIES[c]}
+               for a, c in zip(ledger.amount[:sample].tolist(), ledger.currency[:sample].tolist())]
+
+    def float_loop():
+        total = 0
+        for record in records:
+            total += record["amount"]
+        return total
+
+    seconds, _ = timed(float_loop, repeat=1)
+    report("float loop", seconds, sample, rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="rows for the reductions")
+    parser.add_argument("--load-rows", type=int, default=1_000_000, help="rows for the JSON/Ledger load step")
+    args = parser.parse_args()
+
+    bench_load(min(args.load_rows, args.rows), args.rows)
+    bench_reductions(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Load test for src/report_server.py: requests per second and latency percentiles
+
+    python benchmarks/load_report_server.py                       # spawn a server on synthetic data
+    python benchmarks/load_report_server.py --transactions 200000 --concurrency 100
+    python benchmarks/load_report_server.py --url http://127.0.0.1:8766   # test a running server
+
+Each client keeps one HTTP/1.1 keep-alive connection open and cycles through
+the report paths. With --mutate-every the synthetic income file is appended
+to during the run, so the numbers include cache invalidation and reloads.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+PATHS = ["/summary", "/breakdown", "/monthly", "/chart/monthly_trends.png"]
+INCOME = ["Salary", "Freelance", "Investment", "Bonus", "Other Income"]
+EXPENSES = ["Food", "Transport", "Bills", "Shopping", "Entertainment", "Healthcare", "Education", "Other"]
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"]
+
+
+def write_synthetic_data(data_dir, transactions, seed=0):
+    """Write income/expenses/rates JSON files with the given number of transactions"""
+    rng = random.Random(seed)
+    income, expenses = [], []
+    for i in range(transactions):
+        is_income = rng.random() < 0.3
+        currency = rng.choice(CURRENCIES)
+        (income if is_income else expenses).append({
+            "id": float(i),
+            "date": f"{rng.randint(2024, 2026)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "category": rng.choice(INCOME if is_income else EXPENSES),
+            "description": "",
+            "amount_minor": rng.randint(100, 500_000),
+            "currency": currency,
+            "transaction_type": "income" if is_income else "expense"
+        })
+    files = {
+        "income.json": income,
+        "expenses.json": expenses,
+        "recurring.json": [],
+        "exchange_rates.json": {"base_currency": "USD", "rates": {
+            "USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 149.5, "CAD": 1.36, "AUD": 1.52, "INR": 83.2}}
+    }
+    for name, data in files.items():
+        with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"report server at {url} did not start")
+
+
+async def client(host, port, paths, deadline_count, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while deadline_count[0] > 0:
+            deadline_count[0] -= 1
+            path = random.choice(paths)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f"{path}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+async def mutate(data_dir, interval):
+    """Append a transaction to income.json every interval seconds"""
+    path = os.path.join(data_dir, "income.json")
+    while True:
+        await asyncio.sleep(interval)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data.append({"id": time.time(), "date": time.strftime("%Y-%m-%d"), "category": "Bonus",
+                     "description": "", "amount_minor": 100, "currency": "USD", "transaction_type": "income"})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+async def run(url, paths, requests, concurrency, data_dir=None, mutate_every=None):
+    parts = urlsplit(url)
+    remaining = [requests]
+    latencies, errors = [], []
+    mutator = asyncio.create_task(mutate(data_dir, mutate_every)) if data_dir and mutate_every else None
+    start = time.perf_counter()
+    await asyncio.gather(*(client(parts.hostname, parts.port, paths, remaining, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if mutator:
+        mutator.cancel()
+    return elapsed, latencies, errors
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the report server")
+    parser.add_argument("--url", help="test an already running server instead of spawning one")
+    parser.add_argument("--transactions", type=int, default=50_000, help="synthetic ledger size when spawning")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--paths", default=",".join(PATHS), help="comma-separated paths to cycle through")
+    parser.add_argument("--mutate-every", type=float, help="seconds between data changes when spawning")
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    process = None
+    data_dir = None
+    url = args.url
+    try:
+        if url is None:
+            data_dir = tempfile.mkdtemp(prefix="pft-load-")
+            write_synthetic_data(data_dir, args.transactions)
+            port = free_port()
+            process = subprocess.Popen([sys.executable, os.path.join(SRC, "report_server.py"),
+                                        "--data-dir", data_dir, "--port", str(port), "--poll", "0.5"],
+                                       stdout=subprocess.DEVNULL)
+            url = f"http://127.0.0.1:{port}"
+            print(f"Spawned report server on {url} with {args.transactions:,} transactions")
+        wait_until_ready(url)
+
+        # Warm-up: one request per path so the first timed requests are not all cold misses
+        for path in paths:
+            urllib.request.urlopen(url + path).read()
+
+        elapsed, latencies, errors = asyncio.run(
+            run(url, paths, args.requests, args.concurrency, data_dir, args.mutate_every))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    ms = [v * 1000 for v in latencies]
+    print(f"{len(latencies):,} requests, {args.concurrency} connections, {elapsed:.2f}s")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"  latency ms: p50 {percentile(ms, 50):.2f}  p90 {percentile(ms, 90):.2f}  "
+          f"p99 {percentile(ms, 99):.2f}  max {ms[-1]:.2f}")
+    if errors:
+        print(f"  {len(errors)} errors, e.g. {errors[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import numpy as np
+
+from money import CURRENCIES
+
+
+def month_code(date_str):
+    """Encode a 'YYYY-MM...' date string as a month number (year * 12 + month - 1)"""
+    return int(date_str[:4]) * 12 + int(date_str[5:7]) - 1
+
+
+def month_codes(dates):
+    """Vectorized month_code for a list of 'YYYY-MM-DD' strings; raises ValueError on malformed dates"""
+    def valid(date_str):
+        return (isinstance(date_str, str) and date_str[:7].isascii() and date_str[4:5] == "-"
+                and (date_str[:4] + date_str[5:7]).isdigit())
+
+    try:
+        # Only the 'YYYY-MM' prefix is kept; shorter strings are zero-padded and fail the check below
+        raw = np.array(dates, dtype="S7").reshape(-1)
+    except (UnicodeEncodeError, TypeError, ValueError):
+        raw = None
+    if raw is not None:
+        digits = raw.view(np.uint8).reshape(-1, 7).astype(np.int64) - ord("0")
+        numeric = np.delete(digits, 4, axis=1)
+        ok = not ((numeric < 0).any() or (numeric > 9).any() or (digits[:, 4] != ord("-") - ord("0")).any())
+    if raw is None or not ok:
+        bad = next((d for d in dates if not valid(d)), None)
+        raise ValueError(f"Invalid date: {bad!r}")
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    return year * 12 + digits[:, 5] * 10 + digits[:, 6] - 1
+
+
+class Ledger:
+    """Column store of transactions for fast, exact aggregation
+
+    Amounts are kept as integer minor units in int64 columns alongside integer
+    codes for currency, category, month and income/expense, so every total is
+    a vectorized integer reduction. Totals are returned per currency as Python
+    ints; converting to the base currency (and to float) is left to display.
+    """
+
+    def __init__(self, records=()):
+        records = records if isinstance(records, list) else list(records)
+        count = len(records)
+        currency_index = {c: i for i, c in enumerate(CURRENCIES)}
+        category_index = {}
+
+        # One pass per column straight into int64 arrays; codes are assigned in first-seen order
+        self.amount = np.fromiter((r["amount_minor"] for r in records), dtype=np.int64, count=count)
+        self.currency = np.fromiter((currency_index.setdefault(r["currency"], len(currency_index))
+                                     for r in records), dtype=np.int64, count=count)
+        self.category = np.fromiter((category_index.setdefault(r["category"], len(category_index))
+                                     for r in records), dtype=np.int64, count=count)
+        self.month = month_codes([r["date"] for r in records])
+        self.income = np.fromiter((r["transaction_type"] == "income" for r in records), dtype=bool, count=count)
+        self.currencies = list(currency_index)
+        self.categories = list(category_index)
+
+    @classmethod
+    def from_columns(cls, amount, currency, category, month, income, currencies=None, categories=None):
+        """Build a ledger directly from encoded columns (used for bulk data and benchmarks)"""
+        ledger = cls()
+        if currencies is not None:
+            ledger.currencies = list(currencies)
+        ledger.categories = list(categories or [])
+        ledger.amount = np.asarray(amount, dtype=np.int64)
+        ledger.currency = np.asarray(currency, dtype=np.int64)
+        ledger.category = np.asarray(category, dtype=np.int64)
+        ledger.month = np.asarray(month, dtype=np.int64)
+        ledger.income = np.asarray(income, dtype=bool)
+        return ledger
+
+    def __len__(self):
+        return len(self.amount)
+
+    def _group_totals(self, group, ngroups, rows=None):
+        """Exact int64 sums keyed by (group, income/expense, currency)"""
+        ncur = len(self.currencies)
+        amount, currency, income = self.amount, self.currency, self.income
+        if rows is not None:
+            amount, currency, income = amount[rows], currency[rows], income[rows]
+        key = (group * 2 + income) * ncur + currency
+        # Fall back to exact Python ints if an int64 sum could overflow (hand-edited huge amounts)
+        safe = len(amount) == 0 or int(np.abs(amount).max()) * len(amount) <= np.iinfo(np.int64).max
+        out = np.zeros(ngroups * 2 * ncur, dtype=np.int64 if safe else object)
+        np.add.at(out, key, amount)
+        return out.reshape(ngroups, 2, ncur)
+
+    def _by_currency(self, sums):
+        """Turn a row of per-currency sums into {currency: int} without zero entries"""
+        return {c: int(v) for c, v in zip(self.currencies, sums.tolist()) if v}
+
+    def totals(self):
+        """Return (income, expenses) as {currency: minor units}"""
+        sums = self._group_totals(0, 1)[0]
+        return self._by_currency(sums[1]), self._by_currency(sums[0])
+
+    def category_totals(self):
+        """Return {category: (income, expenses)} with per-currency minor-unit totals"""
+        sums = self._group_totals(self.category, len(self.categories))
+        return {category: (self._by_currency(sums[i][1]), self._by_currency(sums[i][0]))
+                for i, category in enumerate(self.categories)}
+
+    def monthly_totals(self, months):
+        """Return [(income, expenses)] for each 'YYYY-MM' string in months"""
+        if not months:
+            return []
+        codes = np.array([month_code(m) for m in months], dtype=np.int64)
+        first = codes.min()
+        span = int(codes.max() - first) + 1
+        # Lookup table from month offset to output row; rows outside the window go to an extra row
+        table = np.full(span + 1, len(codes), dtype=np.int64)
+        table[codes - first] = np.arange(len(codes))
+        offset = self.month - first
+        offset = np.where((offset >= 0) & (offset < span), offset, span)
+        sums = self._group_totals(table[offset], len(codes) + 1)
+        return [(self._by_currency(sums[i][1]), self._by_currency(sums[i][0])) for i in range(len(codes))]
@@ -2,12 +2,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import csv
-import requests
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
+import itertools
 import os
+from recurring import FREQUENCIES, make_rule, materialize_due, iter_projected
+from rates import RateClient, RateFetchError
+from money import CURRENCIES, to_minor, from_minor, format_minor, migrate_record
+from ledger import Ledger
+import reports
 
 class PersonalFinanceTracker:
     def __init__(self, root):
@@ -19,12 +24,19 @@ class PersonalFinanceTracker:
         self.exchange_rates = {}
         self.base_currency = "USD"
         self.current_currency = "USD"
+        self.rate_client = RateClient()
+        self.rates_future = None
+        self.rates_forced = False
+        self.rates_queued = False
         
         # Data storage files
         self.data_dir = "data"
         self.income_file = os.path.join(self.data_dir, "income.json")
         self.expenses_file = os.path.join(self.data_dir, "expenses.json")
         self.rates_file = os.path.join(self.data_dir, "exchange_rates.json")
+        self.recurring_file = os.path.join(self.data_dir, "recurring.json")
+        # Files whose legacy amounts could not be migrated; never read or written until fixed
+        self.unmigrated_files = set()
         
         # Initialize data storage
         self.setup_data_storage()
@@ -47,9 +59,28 @@ class PersonalFinanceTracker:
         
         if not os.path.exists(self.rates_file):
             self.save_json_file(self.rates_file, {})
+        
+        if not os.path.exists(self.recurring_file):
+            self.save_json_file(self.recurring_file, [])
+        
+        # Migrate float amounts from older data files to integer minor units
+        for filepath in [self.income_file, self.expenses_file, self.recurring_file]:
+            records = self.load_json_file(filepath)
+            try:
+                changed = [migrate_record(record) for record in records]
+            except ValueError as e:
+                self.unmigrated_files.add(filepath)
+                messagebox.showerror("Data error",
+                                     f"Could not convert the amounts in {filepath}: {e}\n\n"
+                                     "The file was left unchanged and is skipped until it is fixed.")
+                continue
+            if any(changed):
+                self.save_json_file(filepath, records)
 
     def load_json_file(self, filepath):
         """Load data from JSON file"""
+        if filepath in self.unmigrated_files:
+            return []
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -58,6 +89,9 @@ class PersonalFinanceTracker:
 
     def save_json_file(self, filepath, data):
         """Save data to JSON file"""
+        if filepath in self.unmigrated_files:
+            messagebox.showerror("Error", f"Not saved: {filepath} could not be migrated and is read-only until it is fixed")
+            return
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
@@ -73,6 +107,7 @@ class PersonalFinanceTracker:
         # Create tabs
         self.setup_transactions_tab()
         self.setup_dashboard_tab()
+        self.setup_recurring_tab()
         self.setup_charts_tab()
         self.setup_settings_tab()
 
@@ -88,7 +123,7 @@ class PersonalFinanceTracker:
         ttk.Label(currency_frame, text="Currency:").pack(side=tk.LEFT, padx=5)
         self.currency_var = tk.StringVar(value="USD")
         self.currency_combo = ttk.Combobox(currency_frame, textvariable=self.currency_var,
-                                          values=["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"], width=10)
+                                          values=CURRENCIES, width=10)
         self.currency_combo.pack(side=tk.LEFT, padx=5)
         self.currency_combo.bind("<<ComboboxSelected>>", self.on_currency_change)
         
@@ -133,6 +168,21 @@ class PersonalFinanceTracker:
         add_btn = ttk.Button(form, text="Add Transaction", command=self.add_transaction)
         add_btn.grid(row=1, column=4, columnspan=2, padx=5, pady=4, sticky=tk.E)
         
+        # Repeat (recurring rule)
+        ttk.Label(form, text="Repeat:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
+        self.repeat_var = tk.StringVar(value="none")
+        repeat_combo = ttk.Combobox(form, textvariable=self.repeat_var,
+                                    values=["none"] + FREQUENCIES, width=13)
+        repeat_combo.grid(row=2, column=1, sticky=tk.W, pady=2)
+        
+        ttk.Label(form, text="Day / Every N days:").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
+        self.repeat_n_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.repeat_n_var, width=6).grid(row=2, column=3, sticky=tk.W, pady=2)
+        
+        ttk.Label(form, text="Until:").grid(row=2, column=4, sticky=tk.W, padx=5, pady=2)
+        self.repeat_until_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.repeat_until_var, width=12).grid(row=2, column=5, sticky=tk.W, pady=2)
+        
         # Transactions list
         list_frame = ttk.Frame(self.transactions_frame, padding=10)
         list_frame.pack(fill=tk.BOTH, expand=True)
@@ -183,6 +233,9 @@ class PersonalFinanceTracker:
         self.net_worth_label = ttk.Label(summary_frame, text="Net Worth: $0.00", font=("Arial", 14, "bold"))
         self.net_worth_label.pack(pady=10)
         
+        self.projected_label = ttk.Label(summary_frame, text="Projected Net (month end): $0.00", font=("Arial", 12))
+        self.projected_label.pack(pady=5)
+        
         # Category breakdown
         breakdown_frame = ttk.LabelFrame(self.dashboard_frame, text="Category Breakdown", padding=10)
         breakdown_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -202,6 +255,34 @@ class PersonalFinanceTracker:
         self.breakdown_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         breakdown_vsb.pack(side=tk.RIGHT, fill=tk.Y)
 
+    def setup_recurring_tab(self):
+        """Setup the recurring tab listing scheduled transaction rules"""
+        self.recurring_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.recurring_frame, text="Recurring")
+        
+        list_frame = ttk.Frame(self.recurring_frame, padding=10)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ("schedule", "start", "until", "type", "category", "description", "amount", "currency")
+        self.recurring_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
+        for col in columns:
+            self.recurring_tree.heading(col, text=col.title())
+            if col == "description":
+                self.recurring_tree.column(col, width=200)
+            elif col in ["amount", "currency"]:
+                self.recurring_tree.column(col, width=80, anchor=tk.E)
+            else:
+                self.recurring_tree.column(col, width=100)
+        
+        recurring_vsb = ttk.Scrollbar(list_frame, orient="vertical", command=self.recurring_tree.yview)
+        self.recurring_tree.configure(yscroll=recurring_vsb.set)
+        self.recurring_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        recurring_vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        btn_frame = ttk.Frame(self.recurring_frame, padding=10)
+        btn_frame.pack(fill=tk.X)
+        ttk.Button(btn_frame, text="Delete Rule", command=self.delete_recurring).pack(side=tk.LEFT, padx=5)
+
     def setup_charts_tab(self):
         """Setup the charts tab for spending trends visualization"""
         self.charts_frame = ttk.Frame(self.notebook)
@@ -214,7 +295,7 @@ class PersonalFinanceTracker:
         ttk.Label(controls_frame, text="Chart Type:").pack(side=tk.LEFT, padx=5)
         self.chart_type_var = tk.StringVar(value="monthly_trends")
         chart_combo = ttk.Combobox(controls_frame, textvariable=self.chart_type_var,
-                                 values=["monthly_trends", "category_pie", "income_vs_expenses"], width=20)
+                                 values=reports.CHARTS, width=20)
         chart_combo.pack(side=tk.LEFT, padx=5)
         
         ttk.Button(controls_frame, text="Generate Chart", command=self.generate_chart).pack(side=tk.LEFT, padx=10)
@@ -238,10 +319,11 @@ class PersonalFinanceTracker:
         ttk.Label(currency_frame, text="Base Currency:").pack(side=tk.LEFT)
         self.base_currency_var = tk.StringVar(value="USD")
         base_currency_combo = ttk.Combobox(currency_frame, textvariable=self.base_currency_var,
-                                         values=["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"], width=10)
+                                         values=CURRENCIES, width=10)
         base_currency_combo.pack(side=tk.LEFT, padx=10)
         
-        ttk.Button(currency_frame, text="Update Exchange Rates", command=self.load_exchange_rates).pack(side=tk.LEFT, padx=10)
+        ttk.Button(currency_frame, text="Update Exchange Rates",
+                   command=lambda: self.load_exchange_rates(force=True)).pack(side=tk.LEFT, padx=10)
         
         # Exchange rates display
         rates_frame = ttk.LabelFrame(settings_content, text="Current Exchange Rates", padding=10)
@@ -264,28 +346,50 @@ class PersonalFinanceTracker:
         
         self.category_combo["values"] = categories
 
-    def load_exchange_rates(self):
-        """Load exchange rates from API"""
+    def load_exchange_rates(self, force=False):
+        """Load cached exchange rates and refresh them from the providers in the background"""
+        cache = self.load_json_file(self.rates_file)
+        if cache.get("rates"):
+            self.exchange_rates = cache["rates"]
+            self.update_rates_display()
+        
+        if self.rates_future is not None and not self.rates_future.done():
+            # A forced update requested during a background fetch runs once that one finishes
+            if force and not self.rates_forced:
+                self.rates_queued = True
+            return
+        
+        # Network access runs on the client's pool so a slow provider never blocks the UI
+        self.rates_future = self.rate_client.fetch_async(self.base_currency, cache, force)
+        self.rates_forced = force
+        self.root.after(100, self.poll_exchange_rates, cache, force)
+
+    def poll_exchange_rates(self, cache, notify):
+        """Apply the result of a background rate fetch once it is available"""
+        if not self.rates_future.done():
+            self.root.after(100, self.poll_exchange_rates, cache, notify)
+            return
+        
+        queued, self.rates_queued = self.rates_queued, False
         try:
-            # Using a free API (you might want to use a more reliable one like exchangerate-api.com)
-            response = requests.get("https://api.exchangerate-api.com/v4/latest/USD", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                self.exchange_rates = data["rates"]
-                
-                # Save the rates to file
-                self.save_json_file(self.rates_file, {
-                    "base_currency": "USD",
-                    "rates": self.exchange_rates,
-                    "date": datetime.now().strftime("%Y-%m-%d")
-                })
-                
-                self.update_rates_display()
+            result = self.rates_future.result()
+        except RateFetchError as e:
+            # A queued update reports its own outcome
+            if not queued and (notify or not self.exchange_rates):
+                messagebox.showerror("Error", f"Error fetching exchange rates: {e}")
+            result = None
+        
+        # Unchanged fetched_at means the cached rates were still fresh and nothing was fetched
+        if result is not None and result.get("fetched_at") != cache.get("fetched_at"):
+            self.exchange_rates = result["rates"]
+            self.save_json_file(self.rates_file, result)
+            self.update_rates_display()
+            self.refresh_data()
+            if notify:
                 messagebox.showinfo("Success", "Exchange rates updated successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to fetch exchange rates")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error fetching exchange rates: {e}")
+        
+        if queued:
+            self.load_exchange_rates(force=True)
 
     def update_rates_display(self):
         """Update the exchange rates display in settings"""
@@ -297,17 +401,7 @@ class PersonalFinanceTracker:
 
     def convert_currency(self, amount, from_currency, to_currency):
         """Convert amount from one currency to another"""
-        if from_currency == to_currency:
-            return amount
-        
-        if from_currency == self.base_currency:
-            return amount * self.exchange_rates.get(to_currency, 1)
-        elif to_currency == self.base_currency:
-            return amount / self.exchange_rates.get(from_currency, 1)
-        else:
-            # Convert to base currency first, then to target
-            base_amount = amount / self.exchange_rates.get(from_currency, 1)
-            return base_amount * self.exchange_rates.get(to_currency, 1)
+        return reports.convert_currency(amount, from_currency, to_currency, self.exchange_rates, self.base_currency)
 
     def add_transaction(self):
         """Add a new transaction (income or expense)"""
@@ -330,9 +424,30 @@ class PersonalFinanceTracker:
             return
         
         try:
-            amount = float(amount_s)
-        except ValueError:
-            messagebox.showerror("Input error", "Amount must be a number")
+            amount = to_minor(amount_s, currency)
+        except ValueError as e:
+            messagebox.showerror("Input error", str(e))
+            return
+        
+        # Recurring transactions are stored as a rule; due occurrences are materialized on refresh
+        frequency = self.repeat_var.get()
+        if frequency != "none":
+            try:
+                rule = make_rule(datetime.now().timestamp(), date, category, desc, amount, currency,
+                                 transaction_type, frequency,
+                                 day=self.repeat_n_var.get().strip() if frequency == "monthly" else None,
+                                 interval=self.repeat_n_var.get().strip() if frequency == "every_n_days" else None,
+                                 end_date=self.repeat_until_var.get().strip() or None)
+            except ValueError as e:
+                messagebox.showerror("Input error", f"Invalid repeat settings: {e}")
+                return
+            
+            rules = self.load_json_file(self.recurring_file)
+            rules.append(rule)
+            self.save_json_file(self.recurring_file, rules)
+            
+            self.refresh_data()
+            self.clear_fields()
             return
         
         # Create transaction record
@@ -341,7 +456,7 @@ class PersonalFinanceTracker:
             "date": date,
             "category": category,
             "description": desc,
-            "amount": amount,
+            "amount_minor": amount,
             "currency": currency,
             "transaction_type": transaction_type
         }
@@ -361,9 +476,97 @@ class PersonalFinanceTracker:
 
     def refresh_data(self):
         """Refresh all data displays"""
+        self.materialize_recurring()
         self.populate_transactions()
-        self.update_dashboard()
-        self.update_breakdown()
+        self.populate_recurring()
+        # Parse the ledger once and share it between the dashboard and the breakdown
+        ledger = self.load_ledger()
+        self.update_dashboard(ledger)
+        self.update_breakdown(ledger)
+
+    def materialize_recurring(self):
+        """Write recurring occurrences that are due up to today into the ledger"""
+        rules = self.load_json_file(self.recurring_file)
+        if not rules or self.unmigrated_files & {self.income_file, self.expenses_file}:
+            # Occurrences stay due until the ledger files can be written again
+            return
+        
+        before = [rule.get("materialized_through") for rule in rules]
+        base_id = datetime.now().timestamp()
+        counter = itertools.count()
+        records = materialize_due(rules, datetime.now().date(), lambda: base_id + next(counter) * 0.001)
+        
+        income = [r for r in records if r["transaction_type"] == "income"]
+        expenses = [r for r in records if r["transaction_type"] != "income"]
+        if income:
+            income_data = self.load_json_file(self.income_file)
+            income_data.extend(income)
+            self.save_json_file(self.income_file, income_data)
+        if expenses:
+            expenses_data = self.load_json_file(self.expenses_file)
+            expenses_data.extend(expenses)
+            self.save_json_file(self.expenses_file, expenses_data)
+        
+        if before != [rule.get("materialized_through") for rule in rules]:
+            self.save_json_file(self.recurring_file, rules)
+
+    def load_projected(self, window_start, window_end):
+        """Return projected (not yet stored) recurring occurrences as (income, expenses) lists"""
+        rules = self.load_json_file(self.recurring_file)
+        income, expenses = [], []
+        for transaction in iter_projected(rules, window_start, window_end):
+            if transaction["transaction_type"] == "income":
+                income.append(transaction)
+            else:
+                expenses.append(transaction)
+        return income, expenses
+
+    def load_ledger(self, include_projected=False):
+        """Load income and expenses (optionally with projected occurrences) into a Ledger"""
+        records = self.load_json_file(self.income_file) + self.load_json_file(self.expenses_file)
+        if include_projected:
+            projected_income, projected_expenses = self.load_projected(*self.projection_window())
+            records += projected_income + projected_expenses
+        return Ledger(records)
+
+    def to_base(self, totals):
+        """Convert exact per-currency minor-unit totals to a base-currency float for display"""
+        return reports.to_base(totals, self.exchange_rates, self.base_currency)
+
+    def projection_window(self):
+        """Return the date window for projected occurrences: tomorrow through the end of this month"""
+        return reports.projection_window(datetime.now().date())
+
+    def populate_recurring(self):
+        """Populate the recurring rules tree"""
+        for row in self.recurring_tree.get_children():
+            self.recurring_tree.delete(row)
+        
+        for rule in self.load_json_file(self.recurring_file):
+            if rule["frequency"] == "monthly":
+                schedule = f"monthly on day {rule['day']}"
+            elif rule["frequency"] == "weekly":
+                schedule = "weekly"
+            else:
+                schedule = f"every {rule['interval']} days"
+            self.recurring_tree.insert("", tk.END, iid=str(rule["id"]), values=(
+                schedule, rule["start_date"], rule["end_date"] or "", rule["transaction_type"],
+                rule["category"], rule["description"], format_minor(rule["amount_minor"], rule["currency"]), rule["currency"]
+            ))
+
+    def delete_recurring(self):
+        """Delete the selected recurring rule (already materialized transactions are kept)"""
+        sel = self.recurring_tree.selection()
+        if not sel:
+            messagebox.showinfo("Info", "Select a rule to delete")
+            return
+        
+        rule_id = float(sel[0])
+        if messagebox.askyesno("Confirm", "Delete selected recurring rule?"):
+            rules = self.load_json_file(self.recurring_file)
+            rules = [r for r in rules if r["id"] != rule_id]
+            self.save_json_file(self.recurring_file, rules)
+            self.refresh_data()
 
     def populate_transactions(self):
         """Populate the transactions tree with combined income and expenses"""
@@ -382,7 +585,7 @@ class PersonalFinanceTracker:
                 transaction["date"],
                 transaction["category"],
                 transaction["description"],
-                transaction["amount"],
+                transaction["amount_minor"],
                 transaction["currency"],
                 transaction["transaction_type"]
             ))
@@ -395,7 +598,7 @@ class PersonalFinanceTracker:
                 transaction["date"],
                 transaction["category"],
                 transaction["description"],
-                transaction["amount"],
+                transaction["amount_minor"],
                 transaction["currency"],
                 transaction["transaction_type"]
             ))
@@ -405,80 +608,41 @@ class PersonalFinanceTracker:
         
         # Insert into tree
         for rid, date, category, desc, amount, currency, trans_type in transactions:
-            converted_amount = self.convert_currency(amount, currency, self.base_currency)
+            converted_amount = self.convert_currency(from_minor(amount, currency), currency, self.base_currency)
             self.tree.insert("", tk.END, iid=str(rid), values=(
                 date, trans_type, category, desc, f"{converted_amount:.2f}", currency
             ))
 
-    def update_dashboard(self):
+    def update_dashboard(self, ledger=None):
         """Update dashboard with financial summary"""
-        # Calculate totals
-        total_income = 0
-        total_expenses = 0
-        
-        # Income total
-        income_data = self.load_json_file(self.income_file)
-        for transaction in income_data:
-            amount = transaction["amount"]
-            currency = transaction["currency"]
-            total_income += self.convert_currency(amount, currency, self.base_currency)
-        
-        # Expenses total
-        expenses_data = self.load_json_file(self.expenses_file)
-        for transaction in expenses_data:
-            amount = transaction["amount"]
-            currency = transaction["currency"]
-            total_expenses += self.convert_currency(amount, currency, self.base_currency)
-        
-        net_worth = total_income - total_expenses
+        if ledger is None:
+            ledger = self.load_ledger()
+        # Exact per-currency totals plus projected recurring occurrences for the rest of this month
+        projected_income, projected_expenses = self.load_projected(*self.projection_window())
+        totals = reports.summary(ledger, Ledger(projected_income + projected_expenses),
+                                 self.exchange_rates, self.base_currency)
+        net_worth = totals["net_worth"]
         
         # Update labels
-        self.total_income_label.config(text=f"Total Income: ${total_income:.2f}")
-        self.total_expenses_label.config(text=f"Total Expenses: ${total_expenses:.2f}")
+        self.total_income_label.config(text=f"Total Income: ${totals['total_income']:.2f}")
+        self.total_expenses_label.config(text=f"Total Expenses: ${totals['total_expenses']:.2f}")
         
         color = "green" if net_worth >= 0 else "red"
         self.net_worth_label.config(text=f"Net Worth: ${net_worth:.2f}", foreground=color)
+        self.projected_label.config(text=f"Projected Net (month end): ${totals['projected_net']:.2f}")
 
-    def update_breakdown(self):
+    def update_breakdown(self, ledger=None):
         """Update category breakdown"""
+        if ledger is None:
+            ledger = self.load_ledger()
         # Clear existing items
         for row in self.breakdown_tree.get_children():
             self.breakdown_tree.delete(row)
         
-        # Get all categories
-        categories = set()
-        
-        income_data = self.load_json_file(self.income_file)
-        for transaction in income_data:
-            categories.add(transaction["category"])
-        
-        expenses_data = self.load_json_file(self.expenses_file)
-        for transaction in expenses_data:
-            categories.add(transaction["category"])
-        
         # Calculate totals per category
-        for category in categories:
-            income_total = 0
-            expense_total = 0
-            
-            # Income for this category
-            for transaction in income_data:
-                if transaction["category"] == category:
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    income_total += self.convert_currency(amount, currency, self.base_currency)
-            
-            # Expenses for this category
-            for transaction in expenses_data:
-                if transaction["category"] == category:
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    expense_total += self.convert_currency(amount, currency, self.base_currency)
-            
-            net = income_total - expense_total
-            
+        for row in reports.breakdown(ledger, self.exchange_rates, self.base_currency):
             self.breakdown_tree.insert("", tk.END, values=(
-                category, f"${income_total:.2f}", f"${expense_total:.2f}", f"${net:.2f}"
+                row["category"], f"${row['income']:.2f}", f"${row['expenses']:.2f}", f"${row['net']:.2f}"
             ))
 
     def generate_chart(self):
@@ -492,134 +656,15 @@ class PersonalFinanceTracker:
         # Create figure
         fig, ax = plt.subplots(figsize=(10, 6))
         
-        if chart_type == "monthly_trends":
-            self.create_monthly_trends_chart(ax)
-        elif chart_type == "category_pie":
-            self.create_category_pie_chart(ax)
-        elif chart_type == "income_vs_expenses":
-            self.create_income_vs_expenses_chart(ax)
+        # Charts include projected recurring occurrences for the rest of this month
+        reports.draw_chart(ax, chart_type, self.load_ledger(include_projected=True),
+                           reports.last_months(datetime.now().date()), self.exchange_rates, self.base_currency)
         
         # Display chart
         canvas = FigureCanvasTkAgg(fig, self.chart_frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-    def create_monthly_trends_chart(self, ax):
-        """Create monthly income vs expenses trend chart"""
-        # Get monthly data
-        months = []
-        income_data = []
-        expense_data = []
-        
-        # Get last 12 months
-        current_date = datetime.now()
-        for i in range(12):
-            month_date = current_date.replace(day=1) - timedelta(days=i*30)
-            month_str = month_date.strftime("%Y-%m")
-            months.insert(0, month_str)
-            
-            # Calculate income for this month
-            month_income = 0
-            income_data_file = self.load_json_file(self.income_file)
-            for transaction in income_data_file:
-                if transaction["date"].startswith(month_str):
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    month_income += self.convert_currency(amount, currency, self.base_currency)
-            income_data.insert(0, month_income)
-            
-            # Calculate expenses for this month
-            month_expenses = 0
-            expenses_data_file = self.load_json_file(self.expenses_file)
-            for transaction in expenses_data_file:
-                if transaction["date"].startswith(month_str):
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    month_expenses += self.convert_currency(amount, currency, self.base_currency)
-            expense_data.insert(0, month_expenses)
-        
-        # Create chart
-        ax.plot(months, income_data, label="Income", marker='o')
-        ax.plot(months, expense_data, label="Expenses", marker='s')
-        ax.set_title("Monthly Income vs Expenses Trend")
-        ax.set_xlabel("Month")
-        ax.set_ylabel(f"Amount ({self.base_currency})")
-        ax.legend()
-        ax.tick_params(axis='x', rotation=45)
-
-    def create_category_pie_chart(self, ax):
-        """Create pie chart of expense categories"""
-        categories = {}
-        
-        expenses_data = self.load_json_file(self.expenses_file)
-        for transaction in expenses_data:
-            category = transaction["category"]
-            amount = transaction["amount"]
-            currency = transaction["currency"]
-            converted_amount = self.convert_currency(amount, currency, self.base_currency)
-            categories[category] = categories.get(category, 0) + converted_amount
-        
-        if categories:
-            labels = list(categories.keys())
-            sizes = list(categories.values())
-            ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-            ax.set_title("Expense Categories Distribution")
-        else:
-            ax.text(0.5, 0.5, "No expense data available", ha='center', va='center', transform=ax.transAxes)
-            ax.set_title("Expense Categories Distribution")
-
-    def create_income_vs_expenses_chart(self, ax):
-        """Create bar chart comparing income vs expenses"""
-        categories = set()
-        
-        # Get all categories
-        income_data = self.load_json_file(self.income_file)
-        for transaction in income_data:
-            categories.add(transaction["category"])
-        
-        expenses_data = self.load_json_file(self.expenses_file)
-        for transaction in expenses_data:
-            categories.add(transaction["category"])
-        
-        categories = list(categories)
-        income_data_chart = []
-        expense_data_chart = []
-        
-        for category in categories:
-            # Income for this category
-            income_total = 0
-            for transaction in income_data:
-                if transaction["category"] == category:
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    income_total += self.convert_currency(amount, currency, self.base_currency)
-            income_data_chart.append(income_total)
-            
-            # Expenses for this category
-            expense_total = 0
-            for transaction in expenses_data:
-                if transaction["category"] == category:
-                    amount = transaction["amount"]
-                    currency = transaction["currency"]
-                    expense_total += self.convert_currency(amount, currency, self.base_currency)
-            expense_data_chart.append(expense_total)
-        
-        if categories:
-            x = range(len(categories))
-            width = 0.35
-            
-            ax.bar([i - width/2 for i in x], income_data_chart, width, label='Income')
-            ax.bar([i + width/2 for i in x], expense_data_chart, width, label='Expenses')
-            
-            ax.set_title("Income vs Expenses by Category")
-            ax.set_xlabel("Categories")
-            ax.set_ylabel(f"Amount ({self.base_currency})")
-            ax.set_xticks(x)
-            ax.set_xticklabels(categories, rotation=45)
-            ax.legend()
-        else:
-            ax.text(0.5, 0.5, "No data available", ha='center', va='center', transform=ax.transAxes)
-
     def delete_selected(self):
         """Delete selected transaction"""
         sel = self.tree.selection()
@@ -657,7 +702,7 @@ class PersonalFinanceTracker:
                         "income",
                         transaction["category"],
                         transaction["description"],
-                        transaction["amount"],
+                        format_minor(transaction["amount_minor"], transaction["currency"]),
                         transaction["currency"]
                     ])
                 
@@ -670,7 +715,7 @@ class PersonalFinanceTracker:
                         "expense",
                         transaction["category"],
                         transaction["description"],
-                        transaction["amount"],
+                        format_minor(transaction["amount_minor"], transaction["currency"]),
                         transaction["currency"]
                     ])
             
@@ -684,6 +729,13 @@ class PersonalFinanceTracker:
         self.category_var.set("")
         self.desc_var.set("")
         self.amount_var.set("")
+        self.clear_repeat_fields()
+
+    def clear_repeat_fields(self):
+        """Reset the repeat settings so the next entry is a one-off transaction"""
+        self.repeat_var.set("none")
+        self.repeat_n_var.set("")
+        self.repeat_until_var.set("")
 
     def on_select(self, event):
         """Handle tree selection"""
@@ -714,9 +766,10 @@ class PersonalFinanceTracker:
             self.date_var.set(transaction["date"])
             self.category_var.set(transaction["category"])
             self.desc_var.set(transaction["description"])
-            self.amount_var.set(str(transaction["amount"]))
+            self.amount_var.set(format_minor(transaction["amount_minor"], transaction["currency"]))
             self.currency_var.set(transaction["currency"])
             self.transaction_type_var.set(transaction["transaction_type"])
+            self.clear_repeat_fields()
 
     def sort_by(self, col, descending):
         """Sort tree by column"""
@@ -737,10 +790,12 @@ class PersonalFinanceTracker:
 
     def on_quit(self):
         """Clean up and quit"""
+        self.rate_client.close()
         self.root.destroy()
 
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = PersonalFinanceTracker(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_quit)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,71 @@
+from decimal import Decimal, DecimalException, ROUND_HALF_UP
+
+CURRENCIES = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"]
+
+# Number of decimal places of each currency's minor unit (ISO 4217); anything else uses 2
+CURRENCY_DECIMALS = {"JPY": 0}
+
+# Largest accepted amount in minor units (10 billion USD, 1 trillion JPY); keeps single amounts
+# far inside int64 so ledgers of millions of rows still sum without overflow
+MAX_MINOR_UNITS = 10 ** 12
+
+# Legacy float amounts predate that cap and are only bounded by the ledger's int64 column
+MAX_LEGACY_MINOR_UNITS = 2 ** 63 - 1
+
+
+def decimals(currency):
+    """Return the number of minor-unit decimal places for a currency"""
+    return CURRENCY_DECIMALS.get(currency, 2)
+
+
+def to_minor(amount, currency, strict=True, limit=MAX_MINOR_UNITS):
+    """Convert a decimal string or number to integer minor units (e.g. cents)
+
+    With strict=True, amounts with more decimal places than the currency allows
+    raise ValueError; otherwise they are rounded half up (used when migrating
+    float amounts from older data files). Amounts beyond limit minor units
+    raise ValueError.
+    """
+    places = decimals(currency)
+    try:
+        value = Decimal(str(amount).strip())
+        if not value.is_finite():
+            raise ValueError(f"Invalid amount: {amount!r}")
+        scaled = value.scaleb(places)
+        if abs(scaled) > limit:
+            raise ValueError(f"Amount too large: at most {format_minor(limit, currency)} {currency}")
+        minor = scaled.quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    except DecimalException:
+        # InvalidOperation, Overflow and friends from malformed or extreme input
+        raise ValueError(f"Invalid amount: {amount!r}")
+
+    if strict and minor != scaled:
+        raise ValueError(f"{currency} amounts allow at most {places} decimal places")
+    return int(minor)
+
+
+def from_minor(minor, currency):
+    """Convert integer minor units to a float, for display and currency conversion only"""
+    return minor / 10 ** decimals(currency)
+
+
+def format_minor(minor, currency):
+    """Format integer minor units exactly as a plain decimal string (e.g. 1234 -> '12.34')"""
+    places = decimals(currency)
+    return str(Decimal(minor).scaleb(-places).quantize(Decimal(1).scaleb(-places)))
+
+
+def migrate_record(record):
+    """Convert a legacy float "amount" field to "amount_minor"; returns True if changed
+
+    Raises ValueError (leaving the record unchanged) if the amount cannot be converted.
+    """
+    if "amount_minor" in record or "amount" not in record:
+        return False
+    try:
+        amount, currency = repr(float(record["amount"])), record["currency"]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid legacy record: {record!r}")
+    record["amount_minor"] = to_minor(amount, currency, strict=False, limit=MAX_LEGACY_MINOR_UNITS)
+    del record["amount"]
+    return True
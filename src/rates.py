@@ -0,0 +1,164 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Providers are tried in parallel; each URL is formatted with the base currency and must
+# return JSON with a "rates" mapping. PFT_RATE_PROVIDERS (comma separated) overrides them,
+# e.g. to point at the local stub server in stub_rate_server.py.
+DEFAULT_PROVIDERS = [
+    "https://api.exchangerate-api.com/v4/latest/{base}",
+    "https://open.er-api.com/v6/latest/{base}",
+]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateFetchError(Exception):
+    """Raised when no provider returned valid rates within the latency budget"""
+
+
+def configured_providers():
+    """Return provider URL templates from PFT_RATE_PROVIDERS, or the defaults if it lists none"""
+    env = os.environ.get("PFT_RATE_PROVIDERS", "")
+    providers = [url.strip() for url in env.split(",") if url.strip()]
+    return providers or list(DEFAULT_PROVIDERS)
+
+
+def parse_rates(data):
+    """Extract and validate the rates mapping from a provider response"""
+    rates = data.get("rates") if isinstance(data, dict) else None
+    if not isinstance(rates, dict) or not rates:
+        raise ValueError("response has no rates")
+    parsed = {}
+    for currency, rate in rates.items():
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError(f"invalid rate for {currency}")
+        parsed[currency] = float(rate)
+    return parsed
+
+
+class RateClient:
+    """Fetch exchange rates from several providers over one pooled session
+
+    All providers are queried in parallel and the first valid answer within
+    the latency budget wins. Each request is retried a bounded number of times
+    with exponential backoff, sends If-None-Match for a cached ETag, and fresh
+    cached rates (younger than ttl seconds) are returned without any request.
+    Timeouts and retries are capped by the fetch's deadline, so requests that
+    lose or run late end shortly after the budget instead of holding workers.
+    """
+
+    def __init__(self, providers=None, budget=3.0, retries=2, backoff=0.2, ttl=3600, connect_timeout=1.0):
+        self.providers = providers or configured_providers()
+        self.budget = budget
+        self.retries = retries
+        self.backoff = backoff
+        self.ttl = ttl
+        self.connect_timeout = connect_timeout
+
+        # Retries are done in _fetch_one so they can respect the deadline
+        adapter = HTTPAdapter(pool_connections=len(self.providers), pool_maxsize=2 * len(self.providers),
+                              max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # fetch() calls run one at a time on their own pool; the provider pool fits the requests
+        # of the current fetch plus the late ones of the previous fetch, which end by its deadline
+        self.fetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rates-fetch")
+        self.executor = ThreadPoolExecutor(max_workers=2 * len(self.providers), thread_name_prefix="rates")
+
+    def is_fresh(self, cache):
+        """Return True if cached rates are younger than the TTL"""
+        fetched_at = cache.get("fetched_at")
+        return bool(cache.get("rates")) and fetched_at is not None and time.time() - fetched_at < self.ttl
+
+    def _fetch_one(self, url, etag, deadline):
+        """Fetch one provider before the deadline; returns (rates or None if not modified, etag)"""
+        headers = {"If-None-Match": etag} if etag else {}
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout("latency budget exhausted")
+            try:
+                response = self.session.get(url, headers=headers,
+                                            timeout=(min(self.connect_timeout, remaining), remaining))
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    break
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            delay = self.backoff * 2 ** (attempt - 1)
+            if time.monotonic() + delay >= deadline:
+                raise requests.Timeout("latency budget exhausted before retry")
+            time.sleep(delay)
+
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        return parse_rates(response.json()), response.headers.get("ETag")
+
+    def fetch(self, base, cache=None, force=False):
+        """Return an updated cache dict for the base currency
+
+        cache is the previously stored dict (as saved in exchange_rates.json).
+        Raises RateFetchError if no provider answered validly within the budget.
+        """
+        cache = dict(cache or {})
+        if cache.get("base_currency") != base:
+            cache = {}
+        if not force and self.is_fresh(cache):
+            return cache
+
+        etags = cache.get("etags", {})
+        deadline = time.monotonic() + self.budget
+        futures = {}
+        for template in self.providers:
+            url = template.format(base=base)
+            futures[self.executor.submit(self._fetch_one, url, etags.get(url), deadline)] = url
+
+        errors = []
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                url = futures[future]
+                try:
+                    rates, etag = future.result()
+                except (requests.RequestException, ValueError) as e:
+                    errors.append(f"{url}: {e}")
+                    continue
+                if rates is None:
+                    if not cache.get("rates"):
+                        errors.append(f"{url}: not modified but nothing cached")
+                        continue
+                    rates = cache["rates"]
+                return {
+                    "base_currency": base,
+                    "rates": rates,
+                    "date": datetime.now().strftime("%Y-%m-%d"),
+                    "fetched_at": time.time(),
+                    "provider": url,
+                    "etags": {url: etag} if etag else {}
+                }
+        except FuturesTimeoutError:
+            errors.append(f"no answer within {self.budget:.1f}s")
+        finally:
+            # Losing or late requests give up at the deadline; their results are ignored
+            for future in futures:
+                future.cancel()
+
+        raise RateFetchError("; ".join(errors))
+
+    def fetch_async(self, base, cache=None, force=False):
+        """Run fetch() on the client's pool and return a Future"""
+        return self.fetch_executor.submit(self.fetch, base, cache, force)
+
+    def close(self):
+        """Release pooled connections and worker threads"""
+        self.fetch_executor.shutdown(wait=False, cancel_futures=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
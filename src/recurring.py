@@ -0,0 +1,127 @@
+import calendar
+from datetime import datetime, date, timedelta
+
+FREQUENCIES = ["monthly", "weekly", "every_n_days"]
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD string into a date (None stays None)"""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def make_rule(rule_id, start_date, category, description, amount_minor, currency, transaction_type,
+              frequency, day=None, interval=None, end_date=None):
+    """Build a compact recurring rule record as stored in recurring.json"""
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {frequency}")
+    start = parse_date(start_date)
+    end = parse_date(end_date)
+    if end is not None and end < start:
+        raise ValueError("End date must not be before start date")
+
+    if frequency == "monthly":
+        day = int(day) if day else start.day
+        if not 1 <= day <= 31:
+            raise ValueError("Day of month must be between 1 and 31")
+        interval = None
+    elif frequency == "weekly":
+        day = None
+        interval = 7
+    else:
+        day = None
+        interval = int(interval) if interval else 0
+        if interval < 1:
+            raise ValueError("Interval must be a positive number of days")
+
+    return {
+        "id": rule_id,
+        "start_date": start_date,
+        "end_date": end_date or None,
+        "frequency": frequency,
+        "day": day,
+        "interval": interval,
+        "category": category,
+        "description": description,
+        "amount_minor": amount_minor,
+        "currency": currency,
+        "transaction_type": transaction_type,
+        # Last date already written to the ledger; occurrences after it are only projected
+        "materialized_through": None
+    }
+
+
+def _monthly_date(year, month, day):
+    """Return day N of the given month, clamped to the month's last day"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def iter_occurrence_dates(rule, window_start, window_end):
+    """Lazily yield occurrence dates of a rule within [window_start, window_end]"""
+    start = parse_date(rule["start_date"])
+    end = parse_date(rule.get("end_date"))
+    lo = max(start, window_start)
+    hi = window_end if end is None else min(end, window_end)
+    if lo > hi:
+        return
+
+    if rule["frequency"] == "monthly":
+        year, month = lo.year, lo.month
+        while True:
+            occurrence = _monthly_date(year, month, rule["day"])
+            if occurrence > hi:
+                return
+            if occurrence >= lo:
+                yield occurrence
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+    else:
+        step = rule["interval"]
+        # Jump straight to the first occurrence inside the window instead of walking from start
+        skipped = -(-(lo - start).days // step)
+        occurrence = start + timedelta(days=skipped * step)
+        delta = timedelta(days=step)
+        while occurrence <= hi:
+            yield occurrence
+            occurrence += delta
+
+
+def occurrence_record(rule, occurrence_date, transaction_id):
+    """Build a ledger transaction for one occurrence of a rule"""
+    return {
+        "id": transaction_id,
+        "date": occurrence_date.strftime("%Y-%m-%d"),
+        "category": rule["category"],
+        "description": rule["description"],
+        "amount_minor": rule["amount_minor"],
+        "currency": rule["currency"],
+        "transaction_type": rule["transaction_type"],
+        "recurring_id": rule["id"]
+    }
+
+
+def iter_projected(rules, window_start, window_end):
+    """Yield not-yet-materialized occurrences of all rules within the window"""
+    for rule in rules:
+        through = parse_date(rule.get("materialized_through"))
+        lo = window_start if through is None else max(window_start, through + timedelta(days=1))
+        for occurrence in iter_occurrence_dates(rule, lo, window_end):
+            yield occurrence_record(rule, occurrence, None)
+
+
+def materialize_due(rules, today, next_id):
+    """Return ledger records for occurrences due up to today and advance each rule
+
+    next_id is called once per record to obtain a unique transaction id.
+    """
+    records = []
+    for rule in rules:
+        through = parse_date(rule.get("materialized_through"))
+        lo = date.min if through is None else through + timedelta(days=1)
+        for occurrence in iter_occurrence_dates(rule, lo, today):
+            records.append(occurrence_record(rule, occurrence, next_id()))
+        if through is None or through < today:
+            rule["materialized_through"] = today.strftime("%Y-%m-%d")
+    return records
@@ -0,0 +1,311 @@
+"""Read-only HTTP report server over the tracker's data directory
+
+Serves the same numbers as the dashboard and charts tabs from one shared
+in-memory ledger, so several people can query it without opening the GUI:
+
+    python src/report_server.py --data-dir data --port 8766
+
+    GET /summary                      dashboard totals
+    GET /breakdown                    per-category income, expenses and net
+    GET /monthly?months=12            monthly income vs expenses trend
+    GET /chart/<type>.png?months=12   chart PNG (monthly_trends, category_pie, income_vs_expenses)
+    GET /health                       data version, never cached
+
+The data files are polled for changes; a change reloads the ledger and
+drops every cached response. Nothing is ever written back to the files.
+"""
+import argparse
+import asyncio
+import copy
+import io
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from ledger import Ledger
+from money import migrate_record
+from recurring import materialize_due, iter_projected
+import reports
+
+log = logging.getLogger("report_server")
+
+DATA_FILES = ["income.json", "expenses.json", "recurring.json", "exchange_rates.json"]
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class Snapshot:
+    """Immutable view of the data directory at one point in time"""
+
+    def __init__(self, data_dir, version, today):
+        self.version = version
+        self.today = today
+
+        income = self._load_records(data_dir, "income.json")
+        expenses = self._load_records(data_dir, "expenses.json")
+        rules = self._load_records(data_dir, "recurring.json")
+        cache = self._load(data_dir, "exchange_rates.json", {})
+
+        # Occurrences the GUI would materialize on its next refresh count as stored ones
+        due = materialize_due(copy.deepcopy(rules), today, lambda: None)
+        projected = list(iter_projected(rules, *reports.projection_window(today)))
+
+        self.ledger = Ledger(income + expenses + due)
+        self.projected = Ledger(projected)
+        self.chart_ledger = Ledger(income + expenses + due + projected)
+        self.rates = cache.get("rates", {})
+        self.base_currency = cache.get("base_currency", "USD")
+
+    @staticmethod
+    def _load(data_dir, name, default):
+        # A JSONDecodeError is not treated as empty: the file may be mid-write, so it propagates
+        try:
+            with open(os.path.join(data_dir, name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    @classmethod
+    def _load_records(cls, data_dir, name):
+        """Load a transaction or rule file, skipping it (like the GUI) if its legacy amounts cannot be migrated"""
+        records = cls._load(data_dir, name, [])
+        try:
+            for record in records:
+                migrate_record(record)
+        except ValueError as e:
+            log.warning("Skipping %s, its amounts could not be converted: %s", name, e)
+            return []
+        return records
+
+
+class ReportState:
+    """The shared ledger snapshot, replaced whenever the data files (or the date) change"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        # The first load must succeed; errors here stop the server from starting
+        self.stamp = self._stamp()
+        self.snapshot = Snapshot(data_dir, 1, self.stamp[0])
+        self.failed_stamp = None
+
+    def _stamp(self):
+        stamp = [datetime.now().date()]
+        for name in DATA_FILES:
+            try:
+                st = os.stat(os.path.join(self.data_dir, name))
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return stamp
+
+    def reload_if_changed(self):
+        """Reload the snapshot if any data file changed; returns True if it did
+
+        If the files cannot be loaded (a half-written file, a malformed record)
+        the previous snapshot is kept and the stamp is left alone, so the next
+        poll tries again.
+        """
+        stamp = self._stamp()
+        if stamp == self.stamp:
+            return False
+        try:
+            snapshot = Snapshot(self.data_dir, self.snapshot.version + 1, stamp[0])
+        except Exception as e:
+            # Retried on every poll, but only reported once per state of the files
+            if stamp != self.failed_stamp:
+                log.warning("Keeping data version %d, reload failed: %s: %s",
+                            self.snapshot.version, type(e).__name__, e)
+            self.failed_stamp = stamp
+            return False
+        # Swapping one reference keeps in-flight requests on a consistent snapshot
+        self.snapshot = snapshot
+        self.stamp = stamp
+        return True
+
+
+def json_body(data):
+    return "application/json", json.dumps(data).encode("utf-8")
+
+
+_chart_lock = threading.Lock()
+
+
+def render_chart(snapshot, chart_type, months):
+    """Render a chart to PNG bytes with the same builders as the Charts tab"""
+    with _chart_lock:
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        reports.draw_chart(ax, chart_type, snapshot.chart_ledger, months,
+                           snapshot.rates, snapshot.base_currency)
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+    return "image/png", buffer.getvalue()
+
+
+def parse_months(query):
+    """Return the months query parameter (default 12); raises ValueError if invalid"""
+    value = parse_qs(query).get("months", ["12"])[0]
+    if not value.isdigit() or not 1 <= int(value) <= 120:
+        raise ValueError("months must be a number between 1 and 120")
+    return int(value)
+
+
+def build_response(snapshot, path, months):
+    """Compute (content type, body) for a cacheable route; raises LookupError for unknown paths"""
+    window = reports.last_months(snapshot.today, months)
+
+    if path == "/summary":
+        return json_body(reports.summary(snapshot.ledger, snapshot.projected,
+                                         snapshot.rates, snapshot.base_currency))
+    if path == "/breakdown":
+        return json_body({
+            "base_currency": snapshot.base_currency,
+            "categories": reports.breakdown(snapshot.ledger, snapshot.rates, snapshot.base_currency)
+        })
+    if path == "/monthly":
+        return json_body(reports.monthly_trend(snapshot.chart_ledger, window,
+                                               snapshot.rates, snapshot.base_currency))
+    if path.startswith("/chart/") and path.endswith(".png"):
+        chart_type = path[len("/chart/"):-len(".png")]
+        if chart_type in reports.CHARTS:
+            return render_chart(snapshot, chart_type, window)
+    raise LookupError(path)
+
+
+class ReportServer:
+    """asyncio HTTP/1.1 server with a per-snapshot response cache"""
+
+    def __init__(self, state, host="127.0.0.1", port=8766, poll_interval=1.0):
+        self.state = state
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        # (version, path, months) -> Future of (content type, body); concurrent misses share one computation
+        self.cache = {}
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                changed = await loop.run_in_executor(None, self.state.reload_if_changed)
+            except Exception:
+                # Never let the watcher die; the cache would then never be invalidated again
+                log.exception("Data file check failed")
+                continue
+            if changed:
+                self.cache.clear()
+
+    async def _get(self, path, query):
+        snapshot = self.state.snapshot
+        if path == "/health":
+            return 200, json_body({"status": "ok", "version": snapshot.version})
+
+        try:
+            months = parse_months(query)
+        except ValueError as e:
+            return 400, json_body({"error": str(e)})
+
+        key = (snapshot.version, path, months)
+        future = self.cache.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, build_response, snapshot, path, months)
+            self.cache[key] = future
+        try:
+            return 200, await asyncio.shield(future)
+        except LookupError:
+            # Only successful responses stay cached
+            self.cache.pop(key, None)
+            return 404, json_body({"error": f"Unknown report: {path}"})
+        except Exception:
+            self.cache.pop(key, None)
+            raise
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    status, (content_type, body) = 400, json_body({"error": "Malformed request"})
+                    method, target, version = "GET", "/", "HTTP/1.0"
+                else:
+                    if method != "GET":
+                        status, (content_type, body) = 405, json_body({"error": "Only GET is supported"})
+                    else:
+                        url = urlsplit(target)
+                        try:
+                            status, (content_type, body) = await self._get(url.path, url.query)
+                        except Exception as e:
+                            status, (content_type, body) = 500, json_body({"error": str(e)})
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"X-Data-Version: {self.state.snapshot.version}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Report server on http://{host}:{port} (data: {os.path.abspath(self.state.data_dir)})", flush=True)
+        watcher = asyncio.create_task(self._watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only report server for the finance tracker")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between data file change checks")
+    args = parser.parse_args()
+
+    # Only this module logs at INFO; the root logger stays at WARNING so matplotlib stays quiet
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    server = ReportServer(ReportState(args.data_dir), args.host, args.port, args.poll)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
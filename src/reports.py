@@ -0,0 +1,154 @@
+"""Aggregations and chart builders shared by the Tk dashboard and the report server
+
+Everything here works on Ledger objects and a rates mapping, with no Tk
+dependency, so the GUI and report_server.py produce identical numbers.
+"""
+import calendar
+from datetime import timedelta
+
+from money import from_minor
+
+
+def convert_currency(amount, from_currency, to_currency, rates, base_currency):
+    """Convert amount from one currency to another using rates relative to base_currency"""
+    if from_currency == to_currency:
+        return amount
+
+    if from_currency == base_currency:
+        return amount * rates.get(to_currency, 1)
+    elif to_currency == base_currency:
+        return amount / rates.get(from_currency, 1)
+    else:
+        # Convert to base currency first, then to target
+        base_amount = amount / rates.get(from_currency, 1)
+        return base_amount * rates.get(to_currency, 1)
+
+
+def to_base(totals, rates, base_currency):
+    """Convert exact per-currency minor-unit totals to a base-currency float for display"""
+    return sum(convert_currency(from_minor(minor, currency), currency, base_currency, rates, base_currency)
+               for currency, minor in totals.items())
+
+
+def projection_window(today):
+    """Return the date window for projected occurrences: tomorrow through the end of this month"""
+    month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+    return today + timedelta(days=1), month_end
+
+
+def last_months(today, count=12):
+    """Return the last count months as 'YYYY-MM' strings, oldest first, ending with today's month"""
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.insert(0, f"{year:04d}-{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+
+def summary(ledger, projected, rates, base_currency):
+    """Return dashboard totals; projected is a Ledger of not-yet-stored occurrences"""
+    income, expenses = ledger.totals()
+    total_income = to_base(income, rates, base_currency)
+    total_expenses = to_base(expenses, rates, base_currency)
+    net_worth = total_income - total_expenses
+
+    projected_income, projected_expenses = projected.totals()
+    projected_net = (net_worth + to_base(projected_income, rates, base_currency)
+                     - to_base(projected_expenses, rates, base_currency))
+    return {
+        "base_currency": base_currency,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_worth": net_worth,
+        "projected_net": projected_net
+    }
+
+
+def breakdown(ledger, rates, base_currency):
+    """Return [{category, income, expenses, net}] in the base currency"""
+    rows = []
+    for category, (income, expenses) in ledger.category_totals().items():
+        income_total = to_base(income, rates, base_currency)
+        expense_total = to_base(expenses, rates, base_currency)
+        rows.append({
+            "category": category,
+            "income": income_total,
+            "expenses": expense_total,
+            "net": income_total - expense_total
+        })
+    return rows
+
+
+def monthly_trend(ledger, months, rates, base_currency):
+    """Return income and expenses per month (lists aligned with months) in the base currency"""
+    monthly = ledger.monthly_totals(months)
+    return {
+        "base_currency": base_currency,
+        "months": list(months),
+        "income": [to_base(income, rates, base_currency) for income, _ in monthly],
+        "expenses": [to_base(expenses, rates, base_currency) for _, expenses in monthly]
+    }
+
+
+def draw_monthly_trends(ax, trend):
+    """Draw the monthly income vs expenses trend chart from monthly_trend() data"""
+    ax.plot(trend["months"], trend["income"], label="Income", marker='o')
+    ax.plot(trend["months"], trend["expenses"], label="Expenses", marker='s')
+    ax.set_title("Monthly Income vs Expenses Trend")
+    ax.set_xlabel("Month")
+    ax.set_ylabel(f"Amount ({trend['base_currency']})")
+    ax.legend()
+    ax.tick_params(axis='x', rotation=45)
+
+
+def draw_category_pie(ax, rows):
+    """Draw the expense categories pie chart from breakdown() rows"""
+    categories = {row["category"]: row["expenses"] for row in rows if row["expenses"]}
+
+    if categories:
+        labels = list(categories.keys())
+        sizes = list(categories.values())
+        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
+        ax.set_title("Expense Categories Distribution")
+    else:
+        ax.text(0.5, 0.5, "No expense data available", ha='center', va='center', transform=ax.transAxes)
+        ax.set_title("Expense Categories Distribution")
+
+
+def draw_income_vs_expenses(ax, rows, base_currency):
+    """Draw the income vs expenses bar chart by category from breakdown() rows"""
+    categories = [row["category"] for row in rows]
+    income_data_chart = [row["income"] for row in rows]
+    expense_data_chart = [row["expenses"] for row in rows]
+
+    if categories:
+        x = range(len(categories))
+        width = 0.35
+
+        ax.bar([i - width/2 for i in x], income_data_chart, width, label='Income')
+        ax.bar([i + width/2 for i in x], expense_data_chart, width, label='Expenses')
+
+        ax.set_title("Income vs Expenses by Category")
+        ax.set_xlabel("Categories")
+        ax.set_ylabel(f"Amount ({base_currency})")
+        ax.set_xticks(x)
+        ax.set_xticklabels(categories, rotation=45)
+        ax.legend()
+    else:
+        ax.text(0.5, 0.5, "No data available", ha='center', va='center', transform=ax.transAxes)
+
+
+CHARTS = ["monthly_trends", "category_pie", "income_vs_expenses"]
+
+
+def draw_chart(ax, chart_type, ledger, months, rates, base_currency):
+    """Draw one of CHARTS for the ledger onto ax"""
+    if chart_type == "monthly_trends":
+        draw_monthly_trends(ax, monthly_trend(ledger, months, rates, base_currency))
+    elif chart_type == "category_pie":
+        draw_category_pie(ax, breakdown(ledger, rates, base_currency))
+    elif chart_type == "income_vs_expenses":
+        draw_income_vs_expenses(ax, breakdown(ledger, rates, base_currency), base_currency)
+    else:
+        raise ValueError(f"Unknown chart type: {chart_type}")
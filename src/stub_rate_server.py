@@ -0,0 +1,106 @@
+"""Local stub exchange-rate provider for offline testing
+
+Run it and point the tracker at it:
+
+    python src/stub_rate_server.py --port 8765
+    PFT_RATE_PROVIDERS=http://127.0.0.1:8765/latest/{base} python src/main.py
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Rates relative to USD for the currencies the tracker supports
+USD_RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 149.5, "CAD": 1.36, "AUD": 1.52, "INR": 83.2}
+
+
+def rates_for(base):
+    """Return stub rates rebased to the given currency"""
+    base_rate = USD_RATES[base]
+    return {currency: round(rate / base_rate, 6) for currency, rate in USD_RATES.items()}
+
+
+class StubRateHandler(BaseHTTPRequestHandler):
+    """Serve GET /latest/<BASE> in the exchangerate-api.com response format"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+        if server.delay:
+            time.sleep(server.delay)
+        if server.status != 200:
+            self.send_error(server.status)
+            return
+
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "latest" or parts[1] not in USD_RATES:
+            self.send_error(404)
+            return
+
+        body = json.dumps({"base": parts[1], "rates": rates_for(parts[1])}).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified_count += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (latency budget exceeded) before the delayed response
+            pass
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def start_stub_server(host="127.0.0.1", port=0, delay=0.0, status=200, quiet=True):
+    """Start a stub provider in a background thread and return the server
+
+    port=0 picks a free port (see server.server_address). delay adds latency to
+    every response and status != 200 makes every request fail, which is handy
+    for exercising the client's latency budget and provider fallback.
+    """
+    server = ThreadingHTTPServer((host, port), StubRateHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.status = status
+    server.quiet = quiet
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.not_modified_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub exchange-rate provider")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to fail every request with")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.host, args.port, args.delay, args.status, quiet=False)
+    host, port = server.server_address[:2]
+    print(f"Stub rate provider on http://{host}:{port}/latest/{{base}}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
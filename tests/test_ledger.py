@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from ledger import Ledger, month_code, month_codes
+from money import CURRENCIES, MAX_MINOR_UNITS
+
+
+def record(amount_minor, currency="USD", category="Food", date="2024-01-15", transaction_type="expense"):
+    return {"amount_minor": amount_minor, "currency": currency, "category": category,
+            "date": date, "transaction_type": transaction_type}
+
+
+def test_empty_ledger():
+    ledger = Ledger([])
+
+    assert len(ledger) == 0
+    assert ledger.totals() == ({}, {})
+    assert ledger.category_totals() == {}
+    assert ledger.monthly_totals(["2024-01"]) == [({}, {})]
+    assert ledger.monthly_totals([]) == []
+
+
+def test_totals_are_per_currency_minor_units():
+    ledger = Ledger([
+        record(1010),
+        record(1500, currency="JPY", category="Salary", transaction_type="income"),
+        record(-10),
+        record(5, currency="XYZ", transaction_type="income"),
+    ])
+
+    assert ledger.totals() == ({"JPY": 1500, "XYZ": 5}, {"USD": 1000})
+
+
+def test_category_totals_keep_first_seen_order():
+    ledger = Ledger([
+        record(100, category="Salary", transaction_type="income"),
+        record(200, category="Food"),
+        record(300, category="Salary", currency="EUR"),
+    ])
+
+    assert ledger.category_totals() == {
+        "Salary": ({"USD": 100}, {"EUR": 300}),
+        "Food": ({}, {"USD": 200}),
+    }
+
+
+def test_monthly_totals_follow_requested_order_and_skip_other_months():
+    ledger = Ledger([
+        record(100, date="2024-01-31"),
+        record(200, date="2024-02-01", transaction_type="income"),
+        record(400, date="2023-12-31"),
+        record(800, date="2025-01-01"),
+    ])
+
+    assert ledger.monthly_totals(["2024-02", "2024-01", "2024-03"]) == [
+        ({"USD": 200}, {}),
+        ({}, {"USD": 100}),
+        ({}, {}),
+    ]
+
+
+def test_sums_of_many_cents_are_exact():
+    rows = 1_000_000
+    ledger = Ledger.from_columns(np.full(rows, 10), np.zeros(rows), np.zeros(rows),
+                                 np.full(rows, month_code("2024-01")), np.zeros(rows, dtype=bool),
+                                 categories=["Food"])
+
+    assert ledger.totals() == ({}, {"USD": rows * 10})
+
+
+def test_sums_beyond_int64_fall_back_to_exact_integers():
+    big = 2 ** 62
+    ledger = Ledger.from_columns([big, big, big], [0, 0, 0], [0, 0, 0],
+                                 [month_code("2024-01")] * 3, [True] * 3, categories=["Food"])
+
+    assert ledger.totals() == ({"USD": 3 * big}, {})
+
+
+def test_random_ledger_matches_python_integer_sums():
+    rng = np.random.default_rng(0)
+    rows = 100_000
+    amount = rng.integers(-10 ** 9, 10 ** 12, rows, dtype=np.int64)
+    currency = rng.integers(0, 7, rows)
+    income = rng.random(rows) < 0.5
+    ledger = Ledger.from_columns(amount, currency, np.zeros(rows), np.full(rows, month_code("2024-01")),
+                                 income, categories=["Food"])
+
+    income_totals, expense_totals = ledger.totals()
+
+    for code, name in enumerate(ledger.currencies):
+        for flag, totals in ((True, income_totals), (False, expense_totals)):
+            selected = amount[(currency == code) & (income == flag)].tolist()
+            assert totals.get(name, 0) == sum(selected)
+
+
+def test_month_codes_match_month_code():
+    dates = ["2024-01-15", "1999-12-31", "2025-06"]
+
+    assert month_codes(dates).tolist() == [month_code(d) for d in dates]
+    assert month_codes([]).tolist() == []
+
+
+@pytest.mark.parametrize("date", ["bad", "2024-1-05", "", None, 20240105, "２０２４-01-05"])
+def test_malformed_dates_raise_value_error(date):
+    with pytest.raises(ValueError, match="Invalid date"):
+        Ledger([record(100), record(100, date=date)])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("max_amount", [10 ** 7, MAX_MINOR_UNITS])
+def test_ten_million_rows_match_python_integer_sums(max_amount):
+    # With amounts up to the input cap the sums exceed int64 and take the exact fallback
+    rng = np.random.default_rng(1)
+    rows = 10_000_000
+    amount = rng.integers(-max_amount, max_amount, rows, dtype=np.int64, endpoint=True)
+    currency = rng.integers(0, len(CURRENCIES), rows)
+    category = rng.integers(0, 13, rows)
+    month = month_code("2024-01") + rng.integers(0, 24, rows)
+    income = rng.random(rows) < 0.3
+    ledger = Ledger.from_columns(amount, currency, category, month, income, CURRENCIES,
+                                 [f"Category {i}" for i in range(13)])
+
+    def reference(rows_mask):
+        totals = {}
+        for code, name in enumerate(CURRENCIES):
+            value = int(amount[rows_mask & (currency == code)].sum(dtype=object))
+            if value:
+                totals[name] = value
+        return totals
+
+    assert ledger.totals() == (reference(income), reference(~income))
+    assert ledger.category_totals()["Category 7"] == (reference(income & (category == 7)),
+                                                       reference(~income & (category == 7)))
+    january = month == month_code("2025-01")
+    assert ledger.monthly_totals(["2025-01"]) == [(reference(income & january), reference(~income & january))]
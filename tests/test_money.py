@@ -0,0 +1,108 @@
+import pytest
+
+from money import MAX_MINOR_UNITS, MAX_LEGACY_MINOR_UNITS, to_minor, from_minor, format_minor, migrate_record
+
+
+def test_to_minor_uses_currency_decimals():
+    assert to_minor("12.34", "USD") == 1234
+    assert to_minor("12", "EUR") == 1200
+    assert to_minor("1500", "JPY") == 1500
+    assert to_minor(" -0.05 ", "USD") == -5
+
+
+@pytest.mark.parametrize("amount, currency", [("12.345", "USD"), ("1500.5", "JPY")])
+def test_to_minor_rejects_extra_decimals(amount, currency):
+    with pytest.raises(ValueError, match="decimal places"):
+        to_minor(amount, currency)
+
+
+@pytest.mark.parametrize("amount", ["", "abc", "nan", "inf", "sNaN", "1e999999999", None])
+def test_to_minor_rejects_invalid_input_with_value_error(amount):
+    with pytest.raises(ValueError):
+        to_minor(amount, "USD")
+
+
+@pytest.mark.parametrize("amount", ["1e17", "1e30", "-1e13", "10000000000.01"])
+def test_to_minor_rejects_amounts_beyond_the_cap(amount):
+    with pytest.raises(ValueError, match="too large"):
+        to_minor(amount, "USD")
+
+
+def test_to_minor_accepts_the_cap():
+    assert to_minor("10000000000.00", "USD") == MAX_MINOR_UNITS
+    assert to_minor(str(MAX_MINOR_UNITS), "JPY") == MAX_MINOR_UNITS
+    assert MAX_MINOR_UNITS < 2 ** 63 - 1
+
+
+def test_to_minor_rounds_half_up_when_not_strict():
+    assert to_minor("0.005", "USD", strict=False) == 1
+    assert to_minor("0.004", "USD", strict=False) == 0
+    assert to_minor("-0.005", "USD", strict=False) == -1
+    assert to_minor("1500.5", "JPY", strict=False) == 1501
+
+
+def test_format_minor_is_exact():
+    assert format_minor(1234, "USD") == "12.34"
+    assert format_minor(5, "USD") == "0.05"
+    assert format_minor(-5, "USD") == "-0.05"
+    assert format_minor(-123456, "USD") == "-1234.56"
+    assert format_minor(1500, "JPY") == "1500"
+    assert format_minor(-1500, "JPY") == "-1500"
+    assert format_minor(123456789012345678, "USD") == "1234567890123456.78"
+
+
+def test_from_minor_is_for_display_only():
+    assert from_minor(1234, "USD") == 12.34
+    assert from_minor(1500, "JPY") == 1500
+
+
+@pytest.mark.parametrize("amount, currency, expected", [
+    (0.1 + 0.2, "USD", 30),
+    (19.99, "USD", 1999),
+    (1.005, "USD", 101),
+    (1500.0, "JPY", 1500),
+    (1499.5, "JPY", 1500),
+])
+def test_migrate_record_converts_legacy_floats(amount, currency, expected):
+    record = {"amount": amount, "currency": currency}
+
+    assert migrate_record(record) is True
+    assert record == {"currency": currency, "amount_minor": expected}
+
+
+def test_migrate_record_leaves_migrated_records_alone():
+    record = {"amount_minor": 30, "currency": "USD"}
+
+    assert migrate_record(record) is False
+    assert record == {"amount_minor": 30, "currency": "USD"}
+
+
+def test_migrate_record_accepts_legacy_amounts_beyond_the_input_cap():
+    record = {"amount": 2e10, "currency": "USD"}
+
+    assert migrate_record(record) is True
+    assert record == {"currency": "USD", "amount_minor": 2 * 10 ** 12}
+    assert 2 * 10 ** 12 > MAX_MINOR_UNITS
+
+
+@pytest.mark.parametrize("record", [
+    {"amount": 1e20, "currency": "USD"},
+    {"amount": float("nan"), "currency": "USD"},
+    {"amount": "abc", "currency": "USD"},
+    {"amount": None, "currency": "USD"},
+    {"amount": 1.5},
+])
+def test_migrate_record_raises_value_error_and_leaves_record_alone(record):
+    keys = set(record)
+
+    with pytest.raises(ValueError):
+        migrate_record(record)
+    assert set(record) == keys
+
+
+def test_migrate_record_limit_fits_int64():
+    record = {"amount": 1e17, "currency": "USD"}
+
+    with pytest.raises(ValueError, match="too large"):
+        migrate_record(record)
+    assert MAX_LEGACY_MINOR_UNITS == 2 ** 63 - 1
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+from rates import DEFAULT_PROVIDERS, RateClient, RateFetchError, configured_providers
+from stub_rate_server import start_stub_server
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def start(**kwargs):
+        server = start_stub_server(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def clients():
+    created = []
+
+    def make(*servers, **kwargs):
+        client = RateClient([url(server) for server in servers], **kwargs)
+        created.append(client)
+        return client
+
+    yield make
+    for client in created:
+        client.close()
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/latest/{{base}}"
+
+
+def test_first_valid_answer_wins_over_slow_provider(stubs, clients):
+    slow, fast = stubs(delay=2.0), stubs()
+    client = clients(slow, fast, budget=1.0)
+
+    start = time.monotonic()
+    result = client.fetch("USD")
+
+    assert time.monotonic() - start < 0.5
+    assert result["provider"] == url(fast).format(base="USD")
+    assert result["rates"]["EUR"] == 0.92
+
+
+def test_falls_back_when_provider_returns_500(stubs, clients):
+    failing, healthy = stubs(status=500), stubs()
+    client = clients(failing, healthy, budget=2.0, backoff=0.01)
+
+    result = client.fetch("USD")
+
+    assert result["provider"] == url(healthy).format(base="USD")
+
+
+def test_failing_provider_is_retried_a_bounded_number_of_times(stubs, clients):
+    failing = stubs(status=503)
+    client = clients(failing, budget=2.0, retries=2, backoff=0.01)
+
+    with pytest.raises(RateFetchError):
+        client.fetch("USD")
+    assert failing.request_count == 3
+
+
+def test_raises_when_budget_runs_out(stubs, clients):
+    client = clients(stubs(delay=2.0), stubs(status=503), budget=0.3, backoff=0.01)
+
+    start = time.monotonic()
+    with pytest.raises(RateFetchError):
+        client.fetch("USD")
+    assert time.monotonic() - start < 1.0
+
+
+def test_repeated_fetches_are_not_starved_by_slow_provider(stubs, clients):
+    slow, fast = stubs(delay=5.0), stubs()
+    client = clients(slow, fast, budget=0.5)
+
+    for _ in range(6):
+        result = client.fetch_async("USD", force=True).result(timeout=2.0)
+        assert result["provider"] == url(fast).format(base="USD")
+
+
+def test_etag_revalidation_keeps_cached_rates(stubs, clients):
+    server = stubs()
+    client = clients(server)
+    first = client.fetch("USD")
+    assert first["etags"]
+
+    second = client.fetch("USD", first, force=True)
+
+    assert server.request_count == 2
+    assert server.not_modified_count == 1
+    assert second["rates"] == first["rates"]
+    assert second["fetched_at"] >= first["fetched_at"]
+
+
+def test_fresh_cache_skips_the_network(stubs, clients):
+    server = stubs()
+    client = clients(server, ttl=60)
+    first = client.fetch("USD")
+
+    assert client.fetch("USD", first) == first
+    assert server.request_count == 1
+
+    stale = dict(first, fetched_at=first["fetched_at"] - 120)
+    client.fetch("USD", stale)
+    assert server.request_count == 2
+
+
+def test_cache_for_another_base_is_ignored(stubs, clients):
+    server = stubs()
+    client = clients(server, ttl=60)
+    usd = client.fetch("USD")
+
+    eur = client.fetch("EUR", usd)
+
+    assert eur["base_currency"] == "EUR"
+    assert eur["rates"]["EUR"] == 1.0
+    assert server.request_count == 2
+
+
+@pytest.mark.parametrize("env, expected", [
+    ("http://a/{base}, http://b/{base}", ["http://a/{base}", "http://b/{base}"]),
+    (",", DEFAULT_PROVIDERS),
+    ("  ", DEFAULT_PROVIDERS),
+])
+def test_configured_providers_fall_back_to_defaults(monkeypatch, env, expected):
+    monkeypatch.setenv("PFT_RATE_PROVIDERS", env)
+
+    assert configured_providers() == expected
+    RateClient().close()
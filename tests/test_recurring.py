@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+from itertools import count
+
+import pytest
+
+from recurring import make_rule, iter_occurrence_dates, iter_projected, materialize_due
+
+
+def rule(frequency="monthly", start_date="2024-01-15", day=None, interval=None, end_date=None):
+    return make_rule(1.0, start_date, "Bills", "Rent", 120000, "USD", "expense",
+                     frequency, day=day, interval=interval, end_date=end_date)
+
+
+def occurrences(r, window_start, window_end):
+    return list(iter_occurrence_dates(r, window_start, window_end))
+
+
+def test_monthly_day_31_is_clamped_to_month_end():
+    r = rule(start_date="2024-01-31")
+
+    assert occurrences(r, date(2024, 1, 1), date(2024, 4, 30)) == [
+        date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30),
+    ]
+    assert occurrences(r, date(2023, 2, 1), date(2025, 2, 28))[-1] == date(2025, 2, 28)
+
+
+def test_every_n_days_window_starting_mid_interval():
+    r = rule("every_n_days", start_date="2024-01-01", interval=10)
+
+    assert occurrences(r, date(2024, 1, 15), date(2024, 2, 10)) == [
+        date(2024, 1, 21), date(2024, 1, 31), date(2024, 2, 10),
+    ]
+
+
+def test_every_n_days_window_starting_on_an_occurrence():
+    r = rule("every_n_days", start_date="2024-01-01", interval=10)
+
+    assert occurrences(r, date(2024, 1, 21), date(2024, 1, 31)) == [date(2024, 1, 21), date(2024, 1, 31)]
+    assert occurrences(r, date(2024, 1, 1), date(2024, 1, 1)) == [date(2024, 1, 1)]
+
+
+@pytest.mark.parametrize("interval", [1, 3, 7, 30])
+def test_every_n_days_jump_matches_walking_from_start(interval):
+    start = date(2024, 1, 1)
+    r = rule("every_n_days", start_date="2024-01-01", interval=interval)
+    walked = [start + timedelta(days=i * interval) for i in range(200 // interval + 1)]
+
+    for offset in range(60):
+        lo = start + timedelta(days=offset)
+        hi = lo + timedelta(days=40)
+        assert occurrences(r, lo, hi) == [d for d in walked if lo <= d <= hi]
+
+
+def test_end_date_cuts_off_occurrences():
+    r = rule("weekly", start_date="2024-01-01", end_date="2024-01-20")
+
+    assert occurrences(r, date(2024, 1, 1), date(2024, 3, 1)) == [
+        date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15),
+    ]
+    assert occurrences(r, date(2024, 1, 21), date(2024, 3, 1)) == []
+
+
+def test_start_date_in_the_future():
+    r = rule(start_date="2024-06-15")
+
+    assert occurrences(r, date(2024, 1, 1), date(2024, 5, 31)) == []
+    assert occurrences(r, date(2024, 1, 1), date(2024, 7, 31)) == [date(2024, 6, 15), date(2024, 7, 15)]
+    assert materialize_due([r], date(2024, 3, 1), count(1).__next__) == []
+
+
+def test_materialize_due_is_idempotent():
+    r = rule(start_date="2024-01-15")
+    ids = count(1)
+
+    first = materialize_due([r], date(2024, 3, 20), ids.__next__)
+
+    assert [record["date"] for record in first] == ["2024-01-15", "2024-02-15", "2024-03-15"]
+    assert [record["id"] for record in first] == [1, 2, 3]
+    assert all(record["recurring_id"] == 1.0 for record in first)
+    assert r["materialized_through"] == "2024-03-20"
+
+    assert materialize_due([r], date(2024, 3, 20), ids.__next__) == []
+    assert r["materialized_through"] == "2024-03-20"
+
+    later = materialize_due([r], date(2024, 4, 15), ids.__next__)
+    assert [record["date"] for record in later] == ["2024-04-15"]
+    assert r["materialized_through"] == "2024-04-15"
+
+
+@pytest.mark.parametrize("today", [date(2024, 3, 14), date(2024, 3, 15), date(2024, 3, 16)])
+def test_projection_never_repeats_materialized_occurrences(today):
+    r = rule(start_date="2024-01-15")
+    materialized = materialize_due([r], today, count(1).__next__)
+
+    projected = list(iter_projected([r], date(2024, 1, 1), date(2024, 5, 31)))
+
+    stored = [record["date"] for record in materialized]
+    upcoming = [record["date"] for record in projected]
+    assert not set(stored) & set(upcoming)
+    assert sorted(stored + upcoming) == ["2024-01-15", "2024-02-15", "2024-03-15", "2024-04-15", "2024-05-15"]
+    assert all(record["id"] is None for record in projected)
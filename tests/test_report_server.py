@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+from datetime import date
+
+import pytest
+
+import reports
+from report_server import ReportServer, ReportState, build_response
+
+
+def record(amount_minor, date="2024-01-15", transaction_type="income"):
+    return {"id": 1.0, "date": date, "category": "Salary", "description": "",
+            "amount_minor": amount_minor, "currency": "USD", "transaction_type": transaction_type}
+
+
+def write(data_dir, name, content):
+    path = data_dir / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def state(tmp_path):
+    write(tmp_path, "income.json", [record(1000)])
+    return ReportState(str(tmp_path))
+
+
+def income(state):
+    return state.snapshot.ledger.totals()[0]
+
+
+def test_reload_picks_up_changes(state, tmp_path):
+    assert state.reload_if_changed() is False
+
+    write(tmp_path, "income.json", [record(1000), record(500)])
+
+    assert state.reload_if_changed() is True
+    assert state.snapshot.version == 2
+    assert income(state) == {"USD": 1500}
+
+
+@pytest.mark.parametrize("content", ["", '[{"amount_minor": 10', "not json"])
+def test_half_written_file_keeps_previous_snapshot(state, tmp_path, content):
+    stamp = state.stamp
+    write(tmp_path, "income.json", content)
+
+    assert state.reload_if_changed() is False
+    assert state.snapshot.version == 1
+    assert state.stamp == stamp
+    assert income(state) == {"USD": 1000}
+
+    write(tmp_path, "income.json", [record(2000)])
+
+    assert state.reload_if_changed() is True
+    assert state.snapshot.version == 2
+    assert income(state) == {"USD": 2000}
+
+
+@pytest.mark.parametrize("bad", [record(10, date="bad"), {"amount_minor": 10, "date": "2024-01-15"}])
+def test_malformed_record_keeps_previous_snapshot(state, tmp_path, bad):
+    write(tmp_path, "income.json", [record(1000), bad])
+
+    assert state.reload_if_changed() is False
+    assert state.snapshot.version == 1
+    # Still failing, so still retried on every poll
+    assert state.reload_if_changed() is False
+
+    write(tmp_path, "income.json", [record(1000), record(10)])
+
+    assert state.reload_if_changed() is True
+    assert income(state) == {"USD": 1010}
+
+
+def test_watcher_survives_errors(state, monkeypatch):
+    server = ReportServer(state, poll_interval=0.01)
+    calls = []
+
+    def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            raise OSError("disk went away")
+        return True
+
+    monkeypatch.setattr(state, "reload_if_changed", flaky)
+    server.cache["stale"] = None
+
+    async def run():
+        watcher = asyncio.create_task(server._watch())
+        try:
+            for _ in range(200):
+                if len(calls) >= 3 or watcher.done():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            watcher.cancel()
+
+    asyncio.run(run())
+
+    assert len(calls) >= 3
+    assert server.cache == {}
+
+
+def test_unconvertible_legacy_file_is_skipped(tmp_path):
+    write(tmp_path, "income.json", [{"id": 1.0, "date": "2024-01-15", "category": "Salary",
+                                     "amount": 1e20, "currency": "USD", "transaction_type": "income"}])
+    legacy = record(0, transaction_type="expense")
+    del legacy["amount_minor"]
+    write(tmp_path, "expenses.json", [dict(legacy, amount=2e10)])
+
+    state = ReportState(str(tmp_path))
+
+    assert state.snapshot.ledger.totals() == ({}, {"USD": 2 * 10 ** 12})
+
+
+@pytest.fixture
+def server(tmp_path):
+    this_month = f"{date.today():%Y-%m}-01"
+    write(tmp_path, "income.json", [record(150000, date=this_month)])
+    write(tmp_path, "expenses.json", [
+        dict(record(5000, date=this_month, transaction_type="expense"), category="Food", currency="EUR"),
+        dict(record(2500, date=this_month, transaction_type="expense"), category="Food"),
+    ])
+    write(tmp_path, "exchange_rates.json", {"base_currency": "USD", "rates": {"EUR": 0.5}})
+    return ReportServer(ReportState(str(tmp_path)))
+
+
+def get(server, path, query=""):
+    status, (content_type, body) = asyncio.run(server._get(path, query))
+    return status, content_type, json.loads(body) if content_type == "application/json" else body
+
+
+def test_summary_matches_dashboard(server):
+    snapshot = server.state.snapshot
+
+    status, _, body = get(server, "/summary")
+
+    assert status == 200
+    assert body == reports.summary(snapshot.ledger, snapshot.projected, snapshot.rates, "USD")
+    assert body == {"base_currency": "USD", "total_income": 1500.0, "total_expenses": 125.0,
+                    "net_worth": 1375.0, "projected_net": 1375.0}
+
+
+def test_breakdown_matches_dashboard(server):
+    snapshot = server.state.snapshot
+
+    status, _, body = get(server, "/breakdown")
+
+    assert status == 200
+    assert body["categories"] == reports.breakdown(snapshot.ledger, snapshot.rates, "USD")
+    assert body["categories"] == [
+        {"category": "Salary", "income": 1500.0, "expenses": 0, "net": 1500.0},
+        {"category": "Food", "income": 0, "expenses": 125.0, "net": -125.0},
+    ]
+
+
+def test_monthly_matches_chart_data(server):
+    snapshot = server.state.snapshot
+    months = reports.last_months(snapshot.today, 3)
+
+    status, _, body = get(server, "/monthly", "months=3")
+
+    assert status == 200
+    assert body == reports.monthly_trend(snapshot.chart_ledger, months, snapshot.rates, "USD")
+    assert body["months"] == months
+    assert body["income"] == [0, 0, 1500.0]
+    assert body["expenses"] == [0, 0, 125.0]
+
+
+def test_chart_is_a_png(server):
+    status, content_type, body = get(server, "/chart/category_pie.png")
+
+    assert status == 200
+    assert content_type == "image/png"
+    assert body.startswith(b"\x89PNG")
+
+
+@pytest.mark.parametrize("query", ["months=0", "months=121", "months=abc"])
+def test_invalid_months_is_a_bad_request(server, query):
+    status, _, body = get(server, "/monthly", query)
+
+    assert status == 400
+    assert "months" in body["error"]
+    assert server.cache == {}
+
+
+@pytest.mark.parametrize("path", ["/chart/bad.png", "/nope"])
+def test_unknown_report_is_not_found_and_not_cached(server, path):
+    status, _, body = get(server, path)
+
+    assert status == 404
+    assert body == {"error": f"Unknown report: {path}"}
+    assert server.cache == {}
+    with pytest.raises(LookupError):
+        build_response(server.state.snapshot, path, 12)
+
+
+def test_responses_are_cached_per_data_version(server, tmp_path, monkeypatch):
+    calls = []
+
+    def counting(snapshot, path, months):
+        calls.append((snapshot.version, path, months))
+        return build_response(snapshot, path, months)
+
+    monkeypatch.setattr("report_server.build_response", counting)
+
+    async def run():
+        first = await server._get("/summary", "")
+        future = server.cache[(1, "/summary", 12)]
+        # Concurrent and repeated requests for the same version share one computation
+        again = await asyncio.gather(server._get("/summary", ""), server._get("/summary", "months=12"))
+        assert server.cache[(1, "/summary", 12)] is future
+        return first, again
+
+    first, again = asyncio.run(run())
+
+    assert calls == [(1, "/summary", 12)]
+    assert again == [first, first]
+
+    write(tmp_path, "income.json", [record(300000)])
+    assert server.state.reload_if_changed() is True
+    status, _, body = get(server, "/summary")
+
+    assert calls == [(1, "/summary", 12), (2, "/summary", 12)]
+    assert set(server.cache) == {(1, "/summary", 12), (2, "/summary", 12)}
+    assert body["total_income"] == 3000.0
+
+
+def test_failed_reload_is_logged_once_per_change(state, tmp_path, caplog):
+    write(tmp_path, "income.json", "not json")
+
+    for _ in range(3):
+        assert state.reload_if_changed() is False
+    write(tmp_path, "income.json", "still not json")
+    assert state.reload_if_changed() is False
+
+    warnings = [r for r in caplog.records if r.name == "report_server"]
+    assert len(warnings) == 2
+    assert "Keeping data version 1" in warnings[0].getMessage()